@@ -148,7 +148,7 @@ def get_presills(filldem, flats, sills, as_positions=True):
         ps_pos = list(zip(ps_rows, ps_cols))
         return ps_pos
     else:
-        presills = np.zeros(dims, dtype=np.bool)
+        presills = np.zeros(dims, dtype=bool)
         presills[ps_rows, ps_cols] = True
         return presills
 
@@ -189,7 +189,7 @@ def get_weights(flats, aux_topo, presills_pos):
 
     Parameters:
     -----------
-    flats : *numpy.array* [dtype = np.bool]
+    flats : *numpy.array* [dtype = bool]
       Numpy array with the location of the flats surfaces
     aux_topo: *numpy.array* [dtype = np.float32]
       Numpy array with the auxiliar topography
@@ -245,7 +245,7 @@ def sort_dem(dem_arr, weights, order="C"):
     ix_flats = np.argsort(-rweights, kind='mergesort')
     
     # Sort the rest of the pixels from the DEM
-    ndx = np.arange(ncells, dtype=np.int)
+    ndx = np.arange(ncells, dtype=np.int64)
     ndx = ndx[ix_flats]
     ix = ndx[np.argsort(-rdem[ndx], kind='mergesort')]
     
@@ -300,7 +300,7 @@ def get_receivers(ix, dem_arr, cellsize, order="C"):
     # Get cardinal neighbors
     footprint= np.array([[0, 1, 0],
                          [1, 1, 1],
-                         [0, 1, 0]], dtype=np.int)
+                         [0, 1, 0]], dtype=np.int64)
     IXC1 = ndimage.morphology.grey_dilation(pp, footprint=footprint)
     xxx1 = np.copy(IXC1)
     IX = IXC1.ravel(order=order)[ix]
@@ -310,7 +310,7 @@ def get_receivers(ix, dem_arr, cellsize, order="C"):
     # Get diagonal neighbors
     footprint= np.array([[1, 0, 1],
                          [0, 1, 0],
-                         [1, 0, 1]], dtype=np.int)
+                         [1, 0, 1]], dtype=np.int64)
     IXC2 = ndimage.morphology.grey_dilation(pp, footprint=footprint)
     xxx2 = np.copy(IXC2)
     IX = IXC2.ravel(order=order)[ix]
@@ -63,7 +63,7 @@ class PreSillTest(unittest.TestCase):
             mpresill_inds = self.load_matlab_array(presills_mlab_path, 'PreSillPixel', np.int32, nodata)
             mpresill_inds = mpresill_inds.ravel() - 1
             row, col = np.unravel_index(mpresill_inds, fill_arr.shape, "F")
-            mpresills = np.zeros(fill_arr.shape, dtype=np.bool)
+            mpresills = np.zeros(fill_arr.shape, dtype=bool)
             mpresills[row, col] = True
             
             # Compare
@@ -16,7 +16,6 @@ import numpy as np
 import gdal
 from scipy import ndimage
 from skimage import graph
-from scipy.sparse import csc_matrix
 from . import Grid, PRaster
 
 class Flow(PRaster):
@@ -278,27 +277,25 @@ class Flow(PRaster):
         ixc = self._ixc[I]
         
         # Recalculate grid channel cells
-        w = np.zeros(self._ncells, dtype=np.bool)
+        w = np.zeros(self._ncells, dtype=bool)
         w[ix] = True
         w[ixc] = True
-        
-        # Build a sparse array with giver-receivers cells
-        aux_vals = np.ones(ix.shape, dtype=np.int8)
-        sp_arr = csc_matrix((aux_vals, (ix, ixc)), shape=(self._ncells, self._ncells))
-        
-        # Get stream POI according the selected type
+
+        # Get stream POI according the selected type. As in Network, giver and
+        # receiver degrees come from np.bincount (one linear scan) instead of
+        # the row/column sums of a sparse giver-receiver matrix
         if kind == 'heads':
-            # Heads will be channel cells marked only as givers (ix) but not as receivers (ixc) 
-            sum_arr = np.asarray(np.sum(sp_arr, 0)).ravel()
-            out_pos = (sum_arr == 0) & w
+            # Heads will be channel cells marked only as givers (ix) but not as receivers (ixc)
+            indeg = np.bincount(ixc, minlength=self._ncells)
+            out_pos = (indeg == 0) & w
         elif kind == 'confluences':
             # Confluences will be channel cells with two or givers
-            sum_arr = np.asarray(np.sum(sp_arr, 0)).ravel()
-            out_pos = sum_arr > 1
+            indeg = np.bincount(ixc, minlength=self._ncells)
+            out_pos = indeg > 1
         elif kind == 'outlets':
-            # Outlets will be channel cells marked only as receivers (ixc) but not as givers (ix) 
-            sum_arr = np.asarray(np.sum(sp_arr, 1)).ravel()
-            out_pos = np.logical_and((sum_arr == 0), w)  
+            # Outlets will be channel cells marked only as receivers (ixc) but not as givers (ix)
+            outdeg = np.bincount(ix, minlength=self._ncells)
+            out_pos = np.logical_and((outdeg == 0), w)
             
         out_pos = out_pos.reshape(self._dims)
         row, col = np.where(out_pos)
@@ -375,7 +372,7 @@ class Flow(PRaster):
             temp_ix = self._ix
             temp_ixc = self._ixc
             nbasins = 0
-            basin_arr = np.zeros(self._ncells, np.int)
+            basin_arr = np.zeros(self._ncells, np.int32)
             nix = len(temp_ix)
             for n in range(nix-1,-1,-1):
                 # If receiver is zero, add a new basin
@@ -395,7 +392,7 @@ class Flow(PRaster):
                 raise FlowError("Some outlets coordinates are outside the grid")
             temp_ix = self._ix
             temp_ixc = self._ixc
-            basin_arr = np.zeros(self._ncells, np.int)
+            basin_arr = np.zeros(self._ncells, np.int32)
 
             # Change basin array outlets by the basin id (starting to 1)
             if inds.size == 1:
@@ -641,7 +638,7 @@ def get_presills(filldem, flats, sills, as_positions=True):
         ps_pos = list(zip(ps_rows, ps_cols))
         return ps_pos
     else:
-        presills = np.zeros(dims, dtype=np.bool)
+        presills = np.zeros(dims, dtype=bool)
         presills[ps_rows, ps_cols] = True
         return presills
 
@@ -682,7 +679,7 @@ def get_weights(flats, aux_topo, presills_pos):
 
     Parameters:
     -----------
-    flats : *numpy.array* [dtype = np.bool]
+    flats : *numpy.array* [dtype = bool]
       Numpy array with the location of the flats surfaces
     aux_topo: *numpy.array* [dtype = np.float32]
       Numpy array with the auxiliar topography
@@ -738,7 +735,7 @@ def sort_dem(dem_arr, weights, order="C"):
     ix_flats = np.argsort(-rweights, kind='mergesort')
     
     # Sort the rest of the pixels from the DEM
-    ndx = np.arange(ncells, dtype=np.int)
+    ndx = np.arange(ncells, dtype=np.int64)
     ndx = ndx[ix_flats]
     ix = ndx[np.argsort(-rdem[ndx], kind='mergesort')]
     
@@ -793,7 +790,7 @@ def get_receivers(ix, dem_arr, cellsize, order="C"):
     # Get cardinal neighbors
     footprint= np.array([[0, 1, 0],
                          [1, 1, 1],
-                         [0, 1, 0]], dtype=np.int)
+                         [0, 1, 0]], dtype=np.int64)
     IXC1 = ndimage.morphology.grey_dilation(pp, footprint=footprint)
     xxx1 = np.copy(IXC1)
     IX = IXC1.ravel(order=order)[ix]
@@ -803,7 +800,7 @@ def get_receivers(ix, dem_arr, cellsize, order="C"):
     # Get diagonal neighbors
     footprint= np.array([[1, 0, 1],
                          [0, 1, 0],
-                         [1, 0, 1]], dtype=np.int)
+                         [1, 0, 1]], dtype=np.int64)
     IXC2 = ndimage.morphology.grey_dilation(pp, footprint=footprint)
     xxx2 = np.copy(IXC2)
     IX = IXC2.ravel(order=order)[ix]
@@ -245,7 +245,7 @@ class Grid(PRaster):
             self._ncells = 1
             # New elements of Grid
             self._nodata = None
-            self._array = np.array([[0]], dtype=np.float)
+            self._array = np.array([[0]], dtype=np.float64)
             self._tipo = str(self._array.dtype)
            
     def set_array(self, array):
@@ -360,7 +360,7 @@ class Grid(PRaster):
         Return the position of the NoData values as a tuple of two arrays (rows, columns)
         """
         if self._nodata is None:
-            return (np.array([], dtype=np.int), np.array([], dtype=np.int))
+            return (np.array([], dtype=np.int64), np.array([], dtype=np.int64))
         else:
             return np.where(self._array == self._nodata)
         
@@ -606,7 +606,7 @@ class DEM(Grid):
         # Use 3x3 square Structuring element
         inside_mask = ndimage.morphology.binary_erosion(
             np.isfinite(copyarr),
-            structure=np.array([[1, 1, 1], [1, 1, 1], [1, 1, 1]]).astype(np.bool))
+            structure=np.array([[1, 1, 1], [1, 1, 1], [1, 1, 1]]).astype(bool))
     
         # Initialize output array as max value test_array except edges
         output_array = np.copy(copyarr)
@@ -618,9 +618,9 @@ class DEM(Grid):
     
         # Cross structuring element
         if four_way:
-            el = np.array([[0, 1, 0], [1, 1, 1], [0, 1, 0]]).astype(np.bool)
+            el = np.array([[0, 1, 0], [1, 1, 1], [0, 1, 0]]).astype(bool)
         else:
-            el = np.array([[1, 1, 1], [1, 1, 1], [1, 1, 1]]).astype(np.bool)
+            el = np.array([[1, 1, 1], [1, 1, 1], [1, 1, 1]]).astype(bool)
     
         # Iterate until marker array doesn't change
         while not np.array_equal(output_old_array, output_array):
@@ -15,13 +15,279 @@
 import numpy as np
 import os
 import ogr, osr
-from scipy.sparse import csc_matrix
+from functools import cached_property
+from numba import njit, prange
+from scipy.spatial import cKDTree
 from . import Grid, PRaster
-  
+
+
+@njit(cache=True)
+def _accumulate_dist(ixc_pos, dd):
+    """
+    Accumulate giver-receiver distances downstream to get distances to mouth.
+    The recurrence di[giver] = di[receiver] + dd is inherently sequential, so
+    it is compiled with numba instead of vectorized. Works on arrays of
+    channel-cell size; ixc_pos holds the position of each receiver inside the
+    sorted giver array (-1 for outlets).
+    """
+    di = np.zeros(dd.size)
+    for n in range(dd.size - 1, -1, -1):
+        if ixc_pos[n] >= 0:
+            di[n] = di[ixc_pos[n]] + dd[n]
+        else:
+            di[n] = dd[n]
+    return di
+
+
+@njit(cache=True)
+def _chi_kernel(ixc_pos, dd, ax_pow, a0):
+    """
+    Accumulate chi values downstream. Same sequential recurrence as
+    _accumulate_dist, with areas already raised to thetaref (ax_pow).
+    """
+    chi = np.zeros(dd.size)
+    for n in range(dd.size - 1, -1, -1):
+        if ixc_pos[n] >= 0:
+            chi[n] = chi[ixc_pos[n]] + a0 * dd[n] / ax_pow[n]
+        else:
+            chi[n] = a0 * dd[n] / ax_pow[n]
+    return chi
+
+
+@njit(cache=True)
+def _propagate_segments(ix, ixc, seg_arr):
+    """
+    Propagate segment ids downstream. Receivers without id take the id of
+    their giver; receivers already marked are confluences and keep their own.
+    """
+    for n in range(ix.size):
+        if seg_arr[ixc[n]] == 0:
+            seg_arr[ixc[n]] = seg_arr[ix[n]]
+
+
+@njit(cache=True)
+def _strahler_order(ix, ixc, str_ord, visited):
+    """
+    Propagate Strahler orders downstream. The order of a receiver grows by
+    one when it joins a giver of its same order. Visited receivers are
+    tracked in a bit-packed array (one bit per cell).
+    """
+    for n in range(ix.size):
+        byte = ixc[n] >> 3
+        bit = np.uint8(1 << (ixc[n] & 7))
+        if (str_ord[ixc[n]] == str_ord[ix[n]]) and (visited[byte] & bit):
+            str_ord[ixc[n]] = str_ord[ixc[n]] + 1
+        else:
+            str_ord[ixc[n]] = max(str_ord[ix[n]], str_ord[ixc[n]])
+            visited[byte] |= bit
+
+
+@njit(cache=True)
+def _shreeve_order(ix, ixc, str_ord, visited):
+    """
+    Propagate Shreeve magnitudes downstream. Magnitudes of the givers are
+    added at each confluence. Visited receivers are tracked in a bit-packed
+    array (one bit per cell).
+    """
+    for n in range(ix.size):
+        byte = ixc[n] >> 3
+        bit = np.uint8(1 << (ixc[n] & 7))
+        if visited[byte] & bit:
+            str_ord[ixc[n]] = str_ord[ixc[n]] + str_ord[ix[n]]
+        else:
+            str_ord[ixc[n]] = max(str_ord[ix[n]], str_ord[ixc[n]])
+            visited[byte] |= bit
+
+
+@njit(cache=True)
+def _gradients_prepass(heads, ixc, ixcix, winlen, ncells):
+    """
+    Serial pre-pass of the gradients traversal. Walks the moving window
+    downstream from every head (in processing order) without fitting anything
+    and records which head owns the value of each channel cell, plus the
+    number of window steps each head performs before it stops. This keeps the
+    first-writer-wins semantics of the serial algorithm while allowing the
+    expensive fitting pass to run in parallel over heads.
+    """
+    owner = np.full(ncells, -1, np.int64)
+    steps = np.full(heads.size, -1, np.int64)
+    win = np.zeros(winlen + 2, dtype=np.int64)
+
+    for h in range(heads.size):
+        head = heads[h]
+        processing = True
+        mcell = ixc[ixcix[head]]
+        fcell = ixc[ixcix[mcell]]
+
+        if ixcix[fcell] == 0 or ixcix[ixc[ixcix[fcell]]] == 0:
+            continue
+
+        win[0] = fcell
+        win[1] = mcell
+        win[2] = head
+        nwin = 3
+        owner[mcell] = h
+        nsteps = 0
+
+        while processing:
+            fcell = win[0]
+            next_cell = ixc[ixcix[fcell]]
+
+            if ixcix[next_cell] != 0:
+                for j in range(nwin, 0, -1):
+                    win[j] = win[j - 1]
+                win[0] = next_cell
+                nwin += 1
+                fcell = win[0]
+                mcell = ixc[ixcix[mcell]]
+
+                if nwin < winlen:
+                    next_cell = ixc[ixcix[fcell]]
+                    for j in range(nwin, 0, -1):
+                        win[j] = win[j - 1]
+                    win[0] = next_cell
+                    nwin += 1
+                else:
+                    nwin -= 1
+            else:
+                mcell = ixc[ixcix[mcell]]
+                nwin -= 2
+                if nwin == 3:
+                    processing = False
+                    owner[fcell] = h
+
+            nsteps += 1
+            if owner[mcell] == -1:
+                owner[mcell] = h
+            else:
+                processing = False
+
+        steps[h] = nsteps
+
+    return owner, steps
+
+
+@njit(parallel=True, cache=True)
+def _gradients_kernel(heads, ixc, ixcix, x_arr, y_arr, winlen, ncells,
+                      owner, steps):
+    """
+    Compute gradients (slope or ksn) for all channel cells by moving a window
+    downstream from every head and fitting a line by least squares in each
+    position. The line is fitted with the closed-form (centered) OLS formulas
+    instead of np.polyfit, which sets up an SVD for every tiny fit. Heads are
+    processed in parallel; the pre-pass ownership and step counts make every
+    write race-free and keep results identical to the serial traversal.
+    """
+    gi = np.zeros(ncells)
+    r2 = np.zeros(ncells)
+
+    for h in prange(heads.size):
+        if steps[h] < 0:
+            continue
+
+        win = np.zeros(winlen + 2, dtype=np.int64)
+        head = heads[h]
+        mcell = ixc[ixcix[head]]
+        fcell = ixc[ixcix[mcell]]
+
+        # Initial window with the first three channel cells
+        win[0] = fcell
+        win[1] = mcell
+        win[2] = head
+        nwin = 3
+
+        if owner[mcell] == h:
+            g, R2 = _win_fit(win, nwin, ixcix, x_arr, y_arr)
+            gi[mcell] = g
+            r2[mcell] = R2
+
+        for it in range(steps[h]):
+            # Take the next cell of the channel (next_cell)
+            fcell = win[0]
+            next_cell = ixc[ixcix[fcell]]
+
+            # If the next cell is not an outlet, the window moves downstream
+            if ixcix[next_cell] != 0:
+                # Insert the next cell at the beginning of the window
+                for j in range(nwin, 0, -1):
+                    win[j] = win[j - 1]
+                win[0] = next_cell
+                nwin += 1
+                fcell = win[0]
+                # Move the middle cell
+                mcell = ixc[ixcix[mcell]]
+
+                if nwin < winlen:
+                    # If we are at the beginning of the channel, the window grows
+                    next_cell = ixc[ixcix[fcell]]
+                    for j in range(nwin, 0, -1):
+                        win[j] = win[j - 1]
+                    win[0] = next_cell
+                    nwin += 1
+                else:
+                    # If we are not, remove the last cell
+                    nwin -= 1
+            # If the next cell is an outlet, the window shrinks
+            else:
+                mcell = ixc[ixcix[mcell]]
+                nwin -= 2
+                if nwin == 3 and owner[fcell] == h:
+                    gi[fcell] = 0.00001
+                    r2[fcell] = 0.00001
+
+            # The gi check mirrors the serial stop condition; without it a
+            # short channel that runs past the outlet sentinel back onto
+            # ixc[0] would rewrite a cell this head already processed
+            if owner[mcell] == h and gi[mcell] == 0.:
+                g, R2 = _win_fit(win, nwin, ixcix, x_arr, y_arr)
+                gi[mcell] = g
+                r2[mcell] = R2
+
+    return gi, r2
+
+
+@njit(cache=True)
+def _win_fit(win, nwin, ixcix, x_arr, y_arr):
+    """
+    Fit a line by least squares to the channel cells of the current window and
+    return (gradient, R2). Sums are centered to keep the fit numerically stable
+    with large coordinate values.
+    """
+    xm = 0.
+    ym = 0.
+    for i in range(nwin):
+        pos = ixcix[win[i]]
+        xm += x_arr[pos]
+        ym += y_arr[pos]
+    xm /= nwin
+    ym /= nwin
+
+    ssx = 0.
+    ssy = 0.
+    spxy = 0.
+    for i in range(nwin):
+        pos = ixcix[win[i]]
+        dx = x_arr[pos] - xm
+        dy = y_arr[pos] - ym
+        ssx += dx * dx
+        ssy += dy * dy
+        spxy += dx * dy
+
+    if ssx == 0.:
+        return 0., 1.
+    g = spxy / ssx
+    # To avoid issues with horizontal colinear points
+    if ssy == 0.:
+        R2 = 1.
+    else:
+        R2 = 1. - (ssy - g * spxy) / ssy
+    return g, R2
+
 
 class Network(PRaster):
 
-    def __init__(self, dem=None, flow=None, threshold=0, thetaref=0.45, npoints=5):
+    def __init__(self, dem=None, flow=None, threshold=0, thetaref=0.45, npoints=5,
+                 dtype=np.float64):
         """
         Class to manipulate cells from a Network, which is defined by applying
         a threshold to a flow accumulation raster derived from a topological 
@@ -40,6 +306,10 @@ class Network(PRaster):
         npoints : *int*
           Number of points to calculate slope and ksn in each cell. Slope and ksn values
           are calculated with a moving window of (npoints * 2 + 1) cells.
+        dtype : *numpy.dtype*
+          Floating point type for distance and chi arrays. np.float32 halves their
+          memory footprint and is usually precise enough for cellsize-scale distances
+          (default np.float64).
         """
         # If dem is a str, load it
         if type(dem)== str:
@@ -58,31 +328,49 @@ class Network(PRaster):
         if threshold == 0:
             threshold = self._ncells * 0.005
         self._threshold = threshold
-        
-        # Get sort Nodes for channel cells
-        fac = flow.get_flow_accumulation(nodata=False, asgrid=False)
-        w = fac > threshold
-        w = w.ravel()
-        I   = w[flow._ix]
-        self._ix  = flow._ix[I]
-        self._ixc = flow._ixc[I]
-        
+        self._dtype = np.dtype(dtype)
+        
+        # Get sort Nodes for channel cells. Flow accumulations are taken at the
+        # giver positions only, so the channel selection and the areas come out
+        # of a single pass without a full-grid boolean mask
+        fac = flow.get_flow_accumulation(nodata=False, asgrid=False).ravel()
+        fac_ix = fac[flow._ix]
+        I   = fac_ix > threshold
+        # Givers and receivers are kept as contiguous int32 arrays; they are
+        # scanned by every recurrence and POI query, and int32 halves the
+        # bandwidth (fine for any DEM below 2**31 cells)
+        self._ix  = flow._ix[I].astype(np.int32, copy=False)
+        self._ixc = flow._ixc[I].astype(np.int32, copy=False)
+
+        # Auxiliar array with the positions of the channel cells inside ix
+        self._ixcix = np.zeros(self._ncells, np.intp)
+        self._ixcix[self._ix] = np.arange(self._ix.size)
+
+        # Position of each receiver inside ix (-1 for outlets), to run the
+        # downstream recurrences on channel-cell sized arrays
+        is_giver = np.zeros(self._ncells, dtype=bool)
+        is_giver[self._ix] = True
+        self._ixc_pos = np.where(is_giver[self._ixc], self._ixcix[self._ixc], -1)
+
         # Get Area, Distance, and Elevations for channel cells
-        self._ax = fac.ravel()[self._ix] * self._cellsize[0] * self._cellsize[1] * -1 # Area in map units
+        self._ax = fac_ix[I] * self._cellsize[0] * self._cellsize[1] * -1 # Area in map units
         self._zx = dem.read_array().ravel()[self._ix]
-        
-        # Get distances to mouth (self._dx) and giver-receiver distances (self._dd)
-        di = np.zeros(self._ncells)
-        self._dd = np.zeros(self._ix.shape) # Giver-Receiver distance
-        for n in np.arange(self._ix.size)[::-1]:
-            grow, gcol = self.ind_2_cell(self._ix[n])
-            rrow, rcol = self.ind_2_cell(self._ixc[n])
-            gx, gy = self.cell_2_xy(grow, gcol)
-            rx, ry = self.cell_2_xy(rrow, rcol)
-            d_gr = np.sqrt((gx - rx)**2 + (gy - ry)**2)
-            self._dd[n] = d_gr
-            di[self._ix[n]] = di[self._ixc[n]] + d_gr
-        self._dx = di[self._ix]
+        del fac, fac_ix
+        
+        # Get giver-receiver distances (self._dd) in a vectorized way, by
+        # converting all the channel cells to xy coordinates at once (the
+        # PRaster conversion methods broadcast over index arrays)
+        grow, gcol = self.ind_2_cell(self._ix)
+        rrow, rcol = self.ind_2_cell(self._ixc)
+        gx, gy = self.cell_2_xy(grow, gcol)
+        rx, ry = self.cell_2_xy(rrow, rcol)
+        self._dd = np.hypot(gx - rx, gy - ry).astype(self._dtype, copy=False)
+
+        # Get distances to mouth (self._dx). Accumulation runs in float64 and
+        # the result is stored with the requested precision
+        self._dx = _accumulate_dist(self._ixc_pos,
+                                    self._dd.astype(np.float64, copy=False))
+        self._dx = self._dx.astype(self._dtype, copy=False)
         
         # Get chi values using the input thetaref
         self._thetaref = thetaref
@@ -92,6 +380,34 @@ class Network(PRaster):
         self.calculate_gradients(npoints, 'slp')
         self.calculate_gradients(npoints, 'ksn')
 
+    @cached_property
+    def _chcells(self):
+        """
+        Linear indexes of all the channel cells (givers and receivers), computed
+        once on first use with a boolean scatter.
+        """
+        w = np.zeros(self._ncells, dtype=bool)
+        w[self._ix] = True
+        w[self._ixc] = True
+        return np.flatnonzero(w)
+
+    def _scratch(self, dtype):
+        """
+        Return a zeroed ncells-sized work array of the given dtype, reusing a
+        persistent per-dtype buffer to avoid repeated full-grid allocations.
+        Only for temporary arrays that are not returned to the caller; reusing
+        the buffers makes Network methods not thread-safe.
+        """
+        dtype = np.dtype(dtype)
+        name = "_buf_" + dtype.name
+        buf = getattr(self, name, None)
+        if buf is None or buf.size < self._ncells:
+            buf = np.empty(self._ncells, dtype)
+            setattr(self, name, buf)
+        buf = buf[:self._ncells]
+        buf[:] = 0
+        return buf
+
     def save(self, path):
         """
         Saves the Network instance to disk. It will be saved as a numpy array in text format.
@@ -152,8 +468,8 @@ class Network(PRaster):
         # Load data array from array file *.npy
         arrfile = os.path.splitext(netfile)[0] + ".npy"
         data_arr = np.load(arrfile)
-        self._ix = data_arr[:, 0].astype(np.int)
-        self._ixc = data_arr[:, 1].astype(np.int)
+        self._ix = data_arr[:, 0].astype(np.int32)
+        self._ixc = data_arr[:, 1].astype(np.int32)
         self._ax = data_arr[:, 2]
         self._dx = data_arr[:, 3]
         self._zx = data_arr[:, 4]
@@ -163,6 +479,17 @@ class Network(PRaster):
         self._r2slp = data_arr[:, 8]
         self._r2ksn = data_arr[:, 9]
         self._dd = data_arr[:, 10]
+        self._dtype = self._dd.dtype
+
+        # Auxiliar array with the positions of the channel cells inside ix
+        self._ixcix = np.zeros(self._ncells, np.intp)
+        self._ixcix[self._ix] = np.arange(self._ix.size)
+
+        # Position of each receiver inside ix (-1 for outlets), to run the
+        # downstream recurrences on channel-cell sized arrays
+        is_giver = np.zeros(self._ncells, dtype=bool)
+        is_giver[self._ix] = True
+        self._ixc_pos = np.where(is_giver[self._ixc], self._ixcix[self._ixc], -1)
          
     def calculate_chi(self, thetaref=0.45, a0=1.0):
         """
@@ -175,10 +502,12 @@ class Network(PRaster):
         a0 : *float*
           Reference area to avoid dimensionality (usually don't need to be changed)
         """
-        chi = np.zeros(self._ncells)
-        for n in np.arange(self._ix.size)[::-1]:
-            chi[self._ix[n]] = chi[self._ixc[n]] + (a0 * self._dd[n]/self._ax[n]**thetaref)            
-        self._chi = chi[self._ix]
+        # Raise areas to thetaref in a single vectorized operation and leave
+        # only the sequential recurrence for the compiled kernel
+        ax_pow = self._ax ** thetaref
+        chi = _chi_kernel(self._ixc_pos, self._dd.astype(np.float64, copy=False),
+                          ax_pow, a0)
+        self._chi = chi.astype(self._dtype, copy=False)
         self._thetaref = thetaref
       
     def calculate_gradients(self, npoints, kind='slp'):
@@ -207,98 +536,25 @@ class Network(PRaster):
             y_arr = self._zx
             
         # Get ixcix auxiliar array
-        ixcix = np.zeros(self._ncells, np.int)
-        ixcix[self._ix] = np.arange(self._ix.size)
-        
-        # Get heads and sorted them by elevation
-        heads = self.get_stream_poi("heads", "IND")
-        elev = self._zx[ixcix[heads]]
-        spos = np.argsort(-elev)
-        heads = heads[spos]
+        ixcix = self._ixcix
+
+        # Get heads (givers with zero in-degree) and sort them by elevation,
+        # working with positions inside the giver array to avoid building a
+        # sparse matrix or translating cell indexes back and forth
+        indeg = np.bincount(self._ixc, minlength=self._ncells)
+        head_pos = np.flatnonzero(indeg[self._ix] == 0)
+        spos = np.argsort(-self._zx[head_pos])
+        heads = self._ix[head_pos[spos]]
         winlen = npoints * 2 + 1
-        gi = np.zeros(self._ncells)
-        r2 = np.zeros(self._ncells)
-        
-        # Taking sequentally all the heads and compute downstream flow
-        for head in heads:
-            processing = True
-            lcell = head
-            mcell = self._ixc[ixcix[head]]
-            fcell = self._ixc[ixcix[mcell]]
-        
-            if ixcix[fcell] == 0 or ixcix[self._ixc[ixcix[fcell]]] == 0:
-                continue
-            
-            # Obtenemos datos de elevacion y distancias
-            win = [fcell, mcell, lcell]
-            xi = x_arr[ixcix[win]]
-            yi = y_arr[ixcix[win]]
-            
-            # Calculamos pendiente de celda central por regresion
-            poli, SCR = np.polyfit(xi, yi, deg = 1, full = True)[:2]
-            # To avoid issues with horizontal colinear points
-            if yi.size * yi.var() == 0:
-                R2 = 1
-            else:
-                R2 = float(1 - SCR/(yi.size * yi.var()))
-            
-            g = poli[0]
-            gi[mcell] = g
-            r2[mcell] = R2
-            
-            while processing:
-                # Cogemos la siguiente celda del canal (next_cell)
-                fcell = win[0]
-                next_cell = self._ixc[ixcix[fcell]]
-                
-                # Comprobamos la siguiente celda del canal
-                # Si la siguiente celda del canal no es cero
-                if ixcix[next_cell] != 0:
-                    # Añadimos siguiente celda
-                    win.insert(0, next_cell)
-                    fcell = win[0]
-                    # Movemos celda central
-                    mcell = self._ixc[ixcix[mcell]]
-        
-                    if len(win) < winlen:
-                        # Si estamos al principio del canal, win crece
-                        next_cell = self._ixc[ixcix[fcell]]
-                        win.insert(0, next_cell)
-                        fcell = win[0]
-                    else:
-                        # Si no estamos al principio, eliminamos celda final
-                        win.pop()
-                # Si la siguiente celda es cero, no añadimos celdas, sino que win decrece
-                else:
-                    mcell = self._ixc[ixcix[mcell]]
-                    win.pop()
-                    win.pop()
-                    if len(win) == 3:
-                        processing = False
-                        gi[fcell] = 0.00001
-                        r2[fcell] = 0.00001
-                        
-                # Obtenemos datos de elevacion y distancias
-                xi = x_arr[ixcix[win]]
-                yi = y_arr[ixcix[win]]
-                
-                # Calculamos pendiente de celda central por regresion
-                poli, SCR = np.polyfit(xi, yi, deg = 1, full = True)[:2]
-                
-                # To avoid issues with horizontal colinear points
-                if yi.size * yi.var() == 0:
-                    R2 = 1
-                else:
-                    R2 = float(1 - SCR/(yi.size * yi.var()))
-            
-                g = poli[0]
-                    
-                if gi[mcell] == 0:
-                    gi[mcell] = g
-                    r2[mcell] = R2
-                else:
-                    processing = False
-        
+
+        # Walk all the heads downstream. A serial pre-pass fixes which head
+        # owns each cell (first-writer-wins, as in the sequential version);
+        # the fitting pass then runs in parallel over heads
+        owner, steps = _gradients_prepass(heads, self._ixc, ixcix, winlen,
+                                          self._ncells)
+        gi, r2 = _gradients_kernel(heads, self._ixc, ixcix, x_arr, y_arr,
+                                   winlen, self._ncells, owner, steps)
+
         if kind == 'slp':
             self._slp = gi[self._ix]
             self._r2slp = r2[self._ix]
@@ -343,39 +599,33 @@ class Network(PRaster):
             if coords not in ['CELL', 'XY', 'IND']:
                 coords = 'CELL'
 
-            # Get grid channel cells
-            w = np.zeros(self._ncells, dtype=np.bool)
-            w[self._ix] = True
-            w[self._ixc] = True
-            
-            # Build a sparse array with giver-receivers cells
-            aux_vals = np.ones(self._ix.shape, dtype=np.int8)
-            sp_arr = csc_matrix((aux_vals, (self._ix, self._ixc)), shape=(self._ncells, self._ncells))
-            
-            # Get stream POI according the selected type
+            # Get stream POI according the selected type. In-degrees and out-degrees
+            # of the channel cells are obtained with np.bincount (a single linear
+            # scan), instead of building a sparse giver-receiver array, and the
+            # POI cells are extracted directly from the giver/receiver arrays
+            # without materializing or scanning any full-grid mask
             if kind == 'heads':
-                # Heads will be channel cells marked only as givers (ix) but not as receivers (ixc) 
-                sum_arr = np.asarray(np.sum(sp_arr, 0)).ravel()
-                out_pos = (sum_arr == 0) & w
+                # Heads will be channel cells marked only as givers (ix) but not as receivers (ixc)
+                indeg = np.bincount(self._ixc, minlength=self._ncells)
+                cells = np.sort(self._ix[indeg[self._ix] == 0])
             elif kind == 'confluences':
                 # Confluences will be channel cells with two or givers
-                sum_arr = np.asarray(np.sum(sp_arr, 0)).ravel()
-                out_pos = sum_arr > 1
+                indeg = np.bincount(self._ixc, minlength=self._ncells)
+                cells = np.unique(self._ixc[indeg[self._ixc] > 1])
             elif kind == 'outlets':
-                # Outlets will be channel cells marked only as receivers (ixc) but not as givers (ix) 
-                sum_arr = np.asarray(np.sum(sp_arr, 1)).ravel()
-                out_pos = np.logical_and((sum_arr == 0), w)  
-                
-            out_pos = out_pos.reshape(self._dims)
-            row, col = np.where(out_pos)
-            
+                # Outlets will be channel cells marked only as receivers (ixc) but not as givers (ix)
+                outdeg = np.bincount(self._ix, minlength=self._ncells)
+                cells = np.unique(self._ixc[outdeg[self._ixc] == 0])
+
+            if coords=="IND":
+                return cells
+
+            row, col = self.ind_2_cell(cells)
             if coords=="CELL":
                 return np.array((row, col)).T
             elif coords=="XY":
                 xi, yi = self.cell_2_xy(row, col)
                 return np.array((xi, yi)).T
-            elif coords=="IND":
-                return self.cell_2_ind(row, col)
 
     def snap_points(self, input_points, kind="channel"):
         """
@@ -405,16 +655,11 @@ class Network(PRaster):
             x, y = self.cell_2_xy(row, col)
             poi = np.array((x, y)).T
         
-        # Get array reshaped for the calculation
-        xi = input_points[:, 0].reshape((input_points.shape[0], 1))
-        yi = input_points[:, 1].reshape((input_points.shape[0], 1))
-        xci = poi[:, 0].reshape((1, poi.shape[0]))
-        yci = poi[:, 1].reshape((1, poi.shape[0]))
-        
-        # Calculate distances and get minimum
-        di = np.sqrt((xi - xci)**2 + (yi - yci)**2 )
-        pos = np.argmin(di, axis=1)
-        
+        # Get the nearest point with a KDTree, avoiding the allocation of a
+        # full (input_points x poi) distance matrix
+        tree = cKDTree(poi)
+        _, pos = tree.query(input_points[:, :2], k=1)
+
         return poi[pos]
     
     def export_2_points(self, path):
@@ -443,8 +688,7 @@ class Network(PRaster):
         """
         # Get grid channel cells
         w = np.zeros(self._ncells, dtype=np.int8)
-        w[self._ix] = 1
-        w[self._ixc] = 1
+        w[self._chcells] = 1
         w = w.reshape(self._dims)
         # Return grid
         if asgrid:
@@ -465,21 +709,18 @@ class Network(PRaster):
         # Get heads and confluences and merge them
         head_ind = self.get_stream_poi("heads", "IND")
         conf_ind = self.get_stream_poi("confluences", "IND")
-        all_ind = np.append(head_ind, conf_ind)
+        all_ind = np.concatenate([head_ind, conf_ind])
         del conf_ind, head_ind # Clean up
         
         # We created a zeros arrays and put in confluences and heads their id
         # Those id will be consecutive numbers starting in one
         seg_arr = np.zeros(self._ncells, dtype=np.int32)
-        for n, inds in enumerate(all_ind):
-            seg_arr[inds] = n+1
-        
+        seg_arr[all_ind] = np.arange(1, all_ind.size + 1, dtype=np.int32)
+
         # Move throught channel list. If receiver is 0, give receiver the same id that giver.
-        # If a receiver is not 0, that means that we are in a confluence. 
-        for n in range(len(self._ix)):
-            if seg_arr[self._ixc[n]] == 0:
-                seg_arr[self._ixc[n]] = seg_arr[self._ix[n]]
-        
+        # If a receiver is not 0, that means that we are in a confluence.
+        _propagate_segments(self._ix, self._ixc, seg_arr)
+
         # Reshape and output
         seg_arr = seg_arr.reshape(self._dims)
         if asgrid:
@@ -503,24 +744,14 @@ class Network(PRaster):
         
         # Get grid channel cells
         str_ord = np.zeros(self._ncells, dtype=np.int8)
-        str_ord[self._ix] = 1
-        str_ord[self._ixc] = 1
-        visited = np.zeros(self._ncells, dtype=np.int8)
+        str_ord[self._chcells] = 1
+        # Bit-packed visited array (one bit per cell)
+        visited = self._scratch(np.uint8)[:(self._ncells + 7) >> 3]
     
         if kind == 'strahler':
-            for n in range(len(self._ix)):
-                if (str_ord[self._ixc[n]] == str_ord[self._ix[n]]) & visited[self._ixc[n]]:
-                    str_ord[self._ixc[n]] = str_ord[self._ixc[n]] + 1                
-                else:
-                    str_ord[self._ixc[n]] = max(str_ord[self._ix[n]], str_ord[self._ixc[n]])
-                    visited[self._ixc[n]] = True
+            _strahler_order(self._ix, self._ixc, str_ord, visited)
         elif kind == 'shreeve':
-            for n in range(len(self._ix)):
-                if visited[self._ixc[n]]:
-                    str_ord[self._ixc[n]] = str_ord[self._ixc[n]] + str_ord[self._ix[n]]
-                else:
-                    str_ord[self._ixc[n]] = max(str_ord[self._ix[n]], str_ord[self._ixc[n]])
-                    visited[self._ixc[n]] = True
+            _shreeve_order(self._ix, self._ixc, str_ord, visited)
         str_ord = str_ord.reshape(self._dims)
         
         if asgrid:
@@ -567,8 +798,7 @@ class Network(PRaster):
         ch_ord = ch_ord[self._ix]
         
         # Get ixcix auxiliar array
-        ixcix = np.zeros(self._ncells, np.int)
-        ixcix[self._ix] = np.arange(self._ix.size)
+        ixcix = self._ixcix
         
         seg_ids = np.unique(ch_seg)
         for idx in seg_ids:
@@ -649,14 +879,13 @@ class Network(PRaster):
         confs = np.array(confs)
     
         # Merge heads and confluences
-        confs = np.append(heads, confs)
+        confs = np.concatenate([heads, confs])
     
         # Get ixcix auxiliar array
-        ixcix = np.zeros(self._ncells, np.int)
-        ixcix[self._ix] = np.arange(self._ix.size)
+        ixcix = self._ixcix
     
         # Auxiliar array to record segment ids
-        seg_arr = np.zeros(self._ncells, np.int)
+        seg_arr = np.zeros(self._ncells, np.int32)
         segid = 1
         
 #        # Iterate confluences -- BAK
@@ -679,8 +908,6 @@ class Network(PRaster):
         # Iterate confluences
         channels = []
         for conf in confs:
-            row, col = self.ind_2_cell(conf)
-            x, y = self.cell_2_xy(row, col)
             ch_idx = [conf]
             order = ch_ord[ixcix[conf]]
             seg_arr[conf] = segid